@@ -0,0 +1,71 @@
+"""
+Shared helpers for reading Z-Wave device configuration files.
+"""
+
+import json
+import os
+import re
+from typing import Any, Iterator
+
+# Fastest available JSON backend: orjson, then python-rapidjson, then the stdlib
+try:
+    import orjson
+    rapidjson = None
+except ImportError:
+    orjson = None
+    try:
+        import rapidjson
+    except ImportError:
+        rapidjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+elif rapidjson is not None:
+    loads = rapidjson.loads
+    JSONDecodeError = rapidjson.JSONDecodeError
+else:
+    loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """
+    Serialize obj as compact UTF-8 JSON with the fastest available backend.
+    The exact bytes differ between backends, so this is for hashing, not for files that get committed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    if rapidjson is not None:
+        return rapidjson.dumps(obj, sort_keys=sort_keys).encode('utf-8')
+    return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':')).encode('utf-8')
+
+
+# Matches either a complete JSON string literal (captured, so it is kept as-is)
+# or a // comment running to the end of the line (not captured, so it is dropped).
+_COMMENT_RE_B = re.compile(rb'("(?:\\.|[^"\\])*")|//[^\n]*')
+
+
+def strip_comments_bytes(data: bytes) -> bytes:
+    """
+    Remove // style comments from UTF-8 encoded JSON, leaving // inside strings intact.
+    Multi-byte UTF-8 sequences never contain '"', '\\', '/' or newline bytes, so no decoding is needed.
+    """
+    return _COMMENT_RE_B.sub(rb'\1', data)
+
+
+def read_file(path) -> bytes:
+    """Read the raw contents of a file."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def iter_json_files(directory: str) -> Iterator[str]:
+    """Recursively yield the paths of all .json files under a directory."""
+    # DirEntry caches the file type from the directory read, so this needs no per-entry stat
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_json_files(entry.path)
+            elif entry.name.endswith('.json'):
+                yield entry.path
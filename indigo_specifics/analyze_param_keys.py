@@ -1,64 +1,51 @@
 #!/usr/bin/env python3
 """
 Analyze all device config files to find unique keys in paramInformation dictionaries.
+
+Can also be run with `pypy3 analyze_param_keys.py`, which uses the stdlib json backend.
 """
 
-import json
-import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Set
-
-def strip_comments(text: str) -> str:
-    """Remove // style comments from JSON text."""
-    lines = []
-    for line in text.split('\n'):
-        in_string = False
-        escaped = False
-        comment_pos = -1
-
-        for i, char in enumerate(line):
-            if escaped:
-                escaped = False
-                continue
-
-            if char == '\\':
-                escaped = True
-                continue
-
-            if char == '"':
-                in_string = not in_string
-                continue
-
-            if not in_string and char == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                comment_pos = i
-                break
-
-        if comment_pos >= 0:
-            lines.append(line[:comment_pos].rstrip())
-        else:
-            lines.append(line)
+from typing import Optional, Set
 
-    return '\n'.join(lines)
+from _json_utils import iter_json_files, loads, read_file, strip_comments_bytes
 
 def extract_param_keys(obj, keys: Set[str]):
     """Recursively find paramInformation arrays and extract keys from their dictionaries."""
     if isinstance(obj, dict):
         # Check if this dict has a paramInformation key
         if 'paramInformation' in obj and isinstance(obj['paramInformation'], list):
-            # Process each item in the paramInformation list
-            for param in obj['paramInformation']:
-                if isinstance(param, dict):
-                    # Add all keys from this parameter dictionary
-                    keys.update(param.keys())
+            # Add all keys from every parameter dictionary in one call; iterating a dict yields its keys
+            keys.update(*(param for param in obj['paramInformation'] if type(param) is dict))
 
-        # Recursively process all values in this dict
+        # Recursively process container values in this dict; scalars can't hold paramInformation.
+        # Parsers only produce plain dicts and lists, so an exact type check is enough.
         for value in obj.values():
-            extract_param_keys(value, keys)
+            t = type(value)
+            if t is dict or t is list:
+                extract_param_keys(value, keys)
 
     elif isinstance(obj, list):
-        # Recursively process all items in this list
+        # Recursively process container items in this list
         for item in obj:
-            extract_param_keys(item, keys)
+            t = type(item)
+            if t is dict or t is list:
+                extract_param_keys(item, keys)
+
+def _process_file(json_file: str) -> Optional[Set[str]]:
+    """Parse one config file and return its paramInformation keys, or None on error."""
+    try:
+        content = read_file(json_file)
+
+        # Strip comments, then parse and extract keys from paramInformation
+        clean_content = strip_comments_bytes(content)
+        keys = set()
+        extract_param_keys(loads(clean_content), keys)
+    except Exception:
+        return None
+
+    return keys
 
 def main():
     base_dir = Path(__file__).parent.parent / "packages" / "config" / "config" / "devices"
@@ -68,28 +55,21 @@ def main():
     error_count = 0
 
     # Find all JSON files
-    json_files = list(base_dir.rglob("*.json"))
+    json_files = list(iter_json_files(str(base_dir)))
 
     print(f"Analyzing {len(json_files)} JSON files...")
 
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Strip comments and parse
-            clean_content = strip_comments(content)
-            data = json.loads(clean_content)
-
-            # Extract keys from paramInformation
-            extract_param_keys(data, all_keys)
+    # Files are independent, so fan the parsing out across all cores
+    with ProcessPoolExecutor() as executor:
+        for keys in executor.map(_process_file, json_files, chunksize=32):
+            if keys is None:
+                error_count += 1
+                # Silently continue on errors
+                continue
 
+            all_keys |= keys
             file_count += 1
 
-        except Exception as e:
-            error_count += 1
-            # Silently continue on errors
-
     print(f"\nProcessed {file_count} files successfully ({error_count} errors)\n")
     print(f"Found {len(all_keys)} unique keys in paramInformation dictionaries:\n")
 
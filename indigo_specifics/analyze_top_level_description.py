@@ -1,44 +1,41 @@
 #!/usr/bin/env python3
 """
 Analyze all device config files to find unique top-level description values.
+
+Can also be run with `pypy3 analyze_top_level_description.py`, which uses the stdlib json backend.
 """
 
 import json
-import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from collections import Counter
-
-def strip_comments(text: str) -> str:
-    """Remove // style comments from JSON text."""
-    lines = []
-    for line in text.split('\n'):
-        in_string = False
-        escaped = False
-        comment_pos = -1
-
-        for i, char in enumerate(line):
-            if escaped:
-                escaped = False
-                continue
-
-            if char == '\\':
-                escaped = True
-                continue
-
-            if char == '"':
-                in_string = not in_string
-                continue
-
-            if not in_string and char == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                comment_pos = i
-                break
-
-        if comment_pos >= 0:
-            lines.append(line[:comment_pos].rstrip())
-        else:
-            lines.append(line)
-
-    return '\n'.join(lines)
+from typing import Optional, Tuple
+
+from _json_utils import iter_json_files, loads, read_file, strip_comments_bytes
+
+def _process_file(json_file: str) -> Tuple[bool, Optional[str]]:
+    """
+    Parse one config file and return (parsed, description).
+    parsed is False if the file could not be read; description is None if there is none.
+    """
+    try:
+        content = read_file(json_file)
+
+        # Strip comments and parse
+        clean_content = strip_comments_bytes(content)
+        data = loads(clean_content)
+    except Exception:
+        return False, None
+
+    # Check for top-level description
+    if isinstance(data, dict) and 'description' in data:
+        desc_value = data['description']
+        # Convert to JSON string for comparison if it's not a simple string
+        if isinstance(desc_value, (list, dict)):
+            return True, json.dumps(desc_value, sort_keys=True)
+        return True, str(desc_value)
+
+    return True, None
 
 def main():
     base_dir = Path(__file__).parent.parent / "packages" / "config" / "config" / "devices"
@@ -49,36 +46,25 @@ def main():
     no_description_count = 0
 
     # Find all JSON files
-    json_files = list(base_dir.rglob("*.json"))
+    json_files = list(iter_json_files(str(base_dir)))
 
     print(f"Analyzing {len(json_files)} JSON files...")
 
-    for json_file in json_files:
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Strip comments and parse
-            clean_content = strip_comments(content)
-            data = json.loads(clean_content)
-
-            # Check for top-level description
-            if isinstance(data, dict) and 'description' in data:
-                desc_value = data['description']
-                # Convert to JSON string for comparison if it's not a simple string
-                if isinstance(desc_value, (list, dict)):
-                    descriptions.append(json.dumps(desc_value, sort_keys=True))
-                else:
-                    descriptions.append(str(desc_value))
-            else:
+    # Files are independent, so fan the parsing out across all cores
+    with ProcessPoolExecutor() as executor:
+        for parsed, description in executor.map(_process_file, json_files, chunksize=32):
+            if not parsed:
+                error_count += 1
+                # Silently continue on errors
+                continue
+
+            if description is None:
                 no_description_count += 1
+            else:
+                descriptions.append(description)
 
             file_count += 1
 
-        except Exception as e:
-            error_count += 1
-            # Silently continue on errors
-
     print(f"\nProcessed {file_count} files successfully ({error_count} errors)")
     print(f"Files without top-level description: {no_description_count}\n")
 
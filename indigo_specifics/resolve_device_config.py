@@ -15,6 +15,7 @@ Example:
 """
 
 import argparse
+import hashlib
 import json
 import os
 import re
@@ -22,31 +23,40 @@ import sys
 from datetime import datetime
 from difflib import unified_diff
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
+
+from _json_utils import JSONDecodeError, dumps, loads, read_file, strip_comments_bytes
+
+
+def config_digest(obj: Any) -> str:
+    """Hash obj's canonical JSON encoding (sorted keys, no whitespace) and return it as hex."""
+    return hashlib.blake2b(dumps(obj, sort_keys=True), digest_size=16).hexdigest()
+
+
+def read_stored_digest(hash_path: Path, output_path: Path) -> Optional[str]:
+    """
+    Read the config digest stored beside an output file.
+    Returns None if there is none, or if the output file was modified after it was written.
+    """
+    try:
+        if hash_path.stat().st_mtime_ns < output_path.stat().st_mtime_ns:
+            return None
+        return hash_path.read_text(encoding='utf-8').strip()
+    except OSError:
+        return None
 
 
 class JsonDiffer:
     """Handles semantic JSON comparison and diff generation."""
 
     @staticmethod
-    def normalize_json(obj: Any) -> Any:
+    def json_objects_equal(obj1: Any, obj2: Any) -> bool:
         """
-        Normalize JSON object for comparison by sorting keys and lists.
-        This ensures that objects with same content but different order compare as equal.
+        Compare two JSON objects for semantic equality.
+        Dict comparison already ignores key order and lists keep theirs, so plain == is
+        enough; it runs in C and stops at the first difference.
         """
-        if isinstance(obj, dict):
-            return {k: JsonDiffer.normalize_json(v) for k, v in sorted(obj.items())}
-        elif isinstance(obj, list):
-            # Sort lists of dicts by their normalized representation
-            # For non-dict items, keep original order
-            return [JsonDiffer.normalize_json(item) for item in obj]
-        else:
-            return obj
-
-    @staticmethod
-    def json_objects_equal(obj1: Any, obj2: Any) -> bool:
-        """Compare two JSON objects for semantic equality."""
-        return JsonDiffer.normalize_json(obj1) == JsonDiffer.normalize_json(obj2)
+        return obj1 == obj2
 
     @staticmethod
     def generate_diff_report(old_obj: Dict, new_obj: Dict, path: str = "") -> List[str]:
@@ -56,76 +66,55 @@ class JsonDiffer:
         """
         diffs = []
 
-        if isinstance(old_obj, dict) and isinstance(new_obj, dict):
-            # Check for removed keys
-            for key in old_obj:
-                if key not in new_obj:
-                    diffs.append(f"- Removed key: {path}.{key}" if path else f"- Removed key: {key}")
-
-            # Check for added keys
-            for key in new_obj:
-                if key not in old_obj:
-                    diffs.append(f"+ Added key: {path}.{key}" if path else f"+ Added key: {key}")
-
-            # Check for modified values
-            for key in old_obj:
-                if key in new_obj:
-                    new_path = f"{path}.{key}" if path else key
-                    if not JsonDiffer.json_objects_equal(old_obj[key], new_obj[key]):
-                        if isinstance(old_obj[key], (dict, list)) and isinstance(new_obj[key], (dict, list)):
-                            diffs.extend(JsonDiffer.generate_diff_report(old_obj[key], new_obj[key], new_path))
-                        else:
-                            diffs.append(f"  Modified: {new_path}")
-                            diffs.append(f"    - Old: {json.dumps(old_obj[key])}")
-                            diffs.append(f"    + New: {json.dumps(new_obj[key])}")
-
-        elif isinstance(old_obj, list) and isinstance(new_obj, list):
-            if len(old_obj) != len(new_obj):
-                diffs.append(f"  Modified array length at {path}: {len(old_obj)} -> {len(new_obj)}")
-
-            # For arrays, show if content differs (don't dive deep into every element)
-            if not JsonDiffer.json_objects_equal(old_obj, new_obj):
-                diffs.append(f"  Modified array content at {path}")
-
-        return diffs
-
-
-class JsonCommentStripper:
-    """Handles JSON files with // comments."""
+        # The stack holds either (old, new, path) nodes still to compare or lists of
+        # finished report lines, pushed in reverse so the report keeps depth-first order.
+        stack: List[Any] = [(old_obj, new_obj, path)]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                diffs.extend(item)
+                continue
 
-    @staticmethod
-    def strip_comments(text: str) -> str:
-        """Remove // style comments from JSON text."""
-        lines = []
-        for line in text.split('\n'):
-            # Find // that's not inside a string
-            in_string = False
-            escaped = False
-            comment_pos = -1
-
-            for i, char in enumerate(line):
-                if escaped:
-                    escaped = False
-                    continue
-
-                if char == '\\':
-                    escaped = True
-                    continue
-
-                if char == '"':
-                    in_string = not in_string
-                    continue
-
-                if not in_string and char == '/' and i + 1 < len(line) and line[i + 1] == '/':
-                    comment_pos = i
-                    break
-
-            if comment_pos >= 0:
-                lines.append(line[:comment_pos].rstrip())
-            else:
-                lines.append(line)
+            old_obj, new_obj, path = item
+
+            if isinstance(old_obj, dict) and isinstance(new_obj, dict):
+                # Check for removed keys
+                for key in old_obj:
+                    if key not in new_obj:
+                        diffs.append(f"- Removed key: {path}.{key}" if path else f"- Removed key: {key}")
+
+                # Check for added keys
+                for key in new_obj:
+                    if key not in old_obj:
+                        diffs.append(f"+ Added key: {path}.{key}" if path else f"+ Added key: {key}")
+
+                # Check for modified values. json_objects_equal stops at the first difference and
+                # arrays are not descended into, so each subtree is walked about once; hashing
+                # every subtree up front (Merkle-style) measured slower than this.
+                pending = []
+                for key in old_obj:
+                    if key in new_obj:
+                        new_path = f"{path}.{key}" if path else key
+                        if not JsonDiffer.json_objects_equal(old_obj[key], new_obj[key]):
+                            if isinstance(old_obj[key], (dict, list)) and isinstance(new_obj[key], (dict, list)):
+                                pending.append((old_obj[key], new_obj[key], new_path))
+                            else:
+                                pending.append([
+                                    f"  Modified: {new_path}",
+                                    f"    - Old: {json.dumps(old_obj[key])}",
+                                    f"    + New: {json.dumps(new_obj[key])}",
+                                ])
+                stack.extend(reversed(pending))
+
+            elif isinstance(old_obj, list) and isinstance(new_obj, list):
+                if len(old_obj) != len(new_obj):
+                    diffs.append(f"  Modified array length at {path}: {len(old_obj)} -> {len(new_obj)}")
+
+                # For arrays, show if content differs (don't dive deep into every element)
+                if not JsonDiffer.json_objects_equal(old_obj, new_obj):
+                    diffs.append(f"  Modified array content at {path}")
 
-        return '\n'.join(lines)
+        return diffs
 
 
 class DeviceConfigResolver:
@@ -141,15 +130,15 @@ class DeviceConfigResolver:
         """
         self.base_dir = base_dir
         self.template_cache: Dict[str, Dict[str, Any]] = {}
+        self.resolved_cache: Dict[Tuple[str, str], Any] = {}
 
     def load_json_file(self, file_path: Path) -> Dict[str, Any]:
         """Load a JSON file, handling // comments."""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = read_file(file_path)
 
-        # Strip comments before parsing
-        clean_content = JsonCommentStripper.strip_comments(content)
-        return json.loads(clean_content)
+        # Strip comments before parsing; the bytes go straight to the parser without decoding
+        clean_content = strip_comments_bytes(content)
+        return loads(clean_content)
 
     def resolve_import_path(self, import_path: str, current_file: Path) -> tuple[Path, str]:
         """
@@ -206,7 +195,7 @@ class DeviceConfigResolver:
 
     def resolve_imports(self, data: Any, current_file: Path) -> Any:
         """
-        Recursively resolve all $import references in data structure.
+        Resolve all $import references in data structure.
 
         Args:
             data: JSON data structure (dict, list, or primitive)
@@ -215,44 +204,61 @@ class DeviceConfigResolver:
         Returns:
             Data structure with all imports resolved
         """
-        if isinstance(data, dict):
-            # Check if this dict has a $import
-            if '$import' in data:
-                import_path = data['$import']
-
-                # Resolve the import
-                template_file, template_key = self.resolve_import_path(import_path, current_file)
-                template_value = self.get_template_value(template_file, template_key)
-
-                # Recursively resolve imports in the template value
-                resolved_template = self.resolve_imports(template_value, template_file)
-
-                # Merge: template values are overridden by local values
-                if isinstance(resolved_template, dict):
-                    result = resolved_template.copy()
-                    for k, v in data.items():
-                        if k != '$import':
-                            # Recursively resolve the override value
-                            result[k] = self.resolve_imports(v, current_file)
-                    return result
-                else:
-                    # Template value is not a dict, can't merge
-                    # Keep other keys from original
-                    if len(data) == 1:
-                        return resolved_template
+        # Containers are copied shallowly and their slots queued as (parent, key, node)
+        # work items, which are then overwritten with the resolved node. Only imported
+        # template values recurse, so call depth follows import nesting, not data depth.
+        root = [data]
+        stack = [(root, 0, data)]
+        while stack:
+            parent, key, node = stack.pop()
+
+            if isinstance(node, dict):
+                # Check if this dict has a $import
+                if '$import' in node:
+                    import_path = node['$import']
+
+                    # Resolve the import
+                    template_file, template_key = self.resolve_import_path(import_path, current_file)
+
+                    # Templates don't change during a run, so each one is resolved only once
+                    cache_key = (str(template_file), template_key)
+                    if cache_key in self.resolved_cache:
+                        resolved_template = self.resolved_cache[cache_key]
                     else:
+                        template_value = self.get_template_value(template_file, template_key)
+
+                        # Resolve imports in the template value relative to the template file
+                        resolved_template = self.resolve_imports(template_value, template_file)
+                        self.resolved_cache[cache_key] = resolved_template
+
+                    # Merge: template values are overridden by local values. The resolved template
+                    # is shared through the cache, so the merged dict is built new in one step.
+                    if isinstance(resolved_template, dict):
+                        overrides = {k: v for k, v in node.items() if k != '$import'}
+                        result = {**resolved_template, **overrides}
+                        # Queue the override values to be resolved
+                        stack.extend((result, k, v) for k, v in overrides.items())
+                        parent[key] = result
+                    elif len(node) == 1:
+                        parent[key] = resolved_template
+                    else:
+                        # Template value is not a dict, can't merge
                         raise ValueError(f"Cannot merge non-dict template value with other keys")
-            else:
-                # No $import, recursively process all values
-                return {k: self.resolve_imports(v, current_file) for k, v in data.items()}
+                else:
+                    # No $import, queue all values
+                    result = dict(node)
+                    parent[key] = result
+                    stack.extend((result, k, v) for k, v in node.items())
 
-        elif isinstance(data, list):
-            # Recursively process list items
-            return [self.resolve_imports(item, current_file) for item in data]
+            elif isinstance(node, list):
+                # Queue list items
+                result = list(node)
+                parent[key] = result
+                stack.extend((result, i, item) for i, item in enumerate(node))
 
-        else:
-            # Primitive value, return as-is
-            return data
+            # Primitive values are already in place in their (copied) parent
+
+        return root[0]
 
     def resolve_device_config(self, manufacturer_id: str, device_filename: str) -> Dict[str, Any]:
         """
@@ -319,7 +325,8 @@ def main():
         if not device_filename.endswith('.json'):
             device_filename += '.json'
 
-        process_device(base_dir, script_dir, args.manufacturer_id, device_filename, silent_mode)
+        resolver = DeviceConfigResolver(base_dir)
+        process_device(resolver, script_dir, args.manufacturer_id, device_filename, silent_mode)
         return
 
     # Interactive mode: loop until user exits
@@ -329,9 +336,14 @@ def main():
         print(f"Error: Manufacturers file not found: {manufacturers_file}")
         sys.exit(1)
 
-    with open(manufacturers_file, 'r', encoding='utf-8') as f:
-        manufacturers_content = JsonCommentStripper.strip_comments(f.read())
-        manufacturers = json.loads(manufacturers_content)
+    manufacturers_content = strip_comments_bytes(read_file(manufacturers_file))
+    manufacturers = loads(manufacturers_content)
+
+    # Lowercase the names once rather than on every search
+    manufacturers_lower = [(mfr_id, mfr_name, mfr_name.lower()) for mfr_id, mfr_name in manufacturers.items()]
+
+    # One resolver for the whole session, so templates parsed for one device are reused by the next
+    resolver = DeviceConfigResolver(base_dir)
 
     while True:
         # Prompt for manufacturer_id
@@ -344,9 +356,12 @@ def main():
             if not search_name:
                 sys.exit(0)
 
-            # Check if user entered a hex ID directly
+            # Check if user entered a hex ID directly; it skips the name scan
             if search_name.lower().startswith('0x'):
-                manufacturer_id = search_name
+                # A known ID is canonicalised to its lowercase key, which matches the device
+                # directory names (so 0X027A finds 0x027a); an unknown ID is kept as typed
+                search_id = search_name.lower()
+                manufacturer_id = search_id if search_id in manufacturers else search_name
                 break
 
             if len(search_name) < 3:
@@ -355,8 +370,8 @@ def main():
 
             # Search for matching manufacturers (case-insensitive)
             search_lower = search_name.lower()
-            matches = [(mfr_id, mfr_name) for mfr_id, mfr_name in manufacturers.items()
-                       if search_lower in mfr_name.lower()]
+            matches = [(mfr_id, mfr_name) for mfr_id, mfr_name, mfr_name_lower in manufacturers_lower
+                       if search_lower in mfr_name_lower]
 
             if matches:
                 print(f"\nFound {len(matches)} matching manufacturer(s):")
@@ -409,15 +424,15 @@ def main():
             device_filename += '.json'
 
         # Process the device
-        process_device(base_dir, script_dir, manufacturer_id, device_filename, silent_mode)
+        process_device(resolver, script_dir, manufacturer_id, device_filename, silent_mode)
         print()  # Add blank line before next iteration
 
 
-def process_device(base_dir: Path, script_dir: Path, manufacturer_id: str, device_filename: str, silent_mode: bool):
+def process_device(resolver: DeviceConfigResolver, script_dir: Path, manufacturer_id: str, device_filename: str,
+                   silent_mode: bool):
     """Process a single device configuration file."""
     try:
-        # Create resolver and resolve the configuration
-        resolver = DeviceConfigResolver(base_dir)
+        # Resolve the configuration
         resolved_config = resolver.resolve_device_config(manufacturer_id, device_filename)
 
         # Determine output path: <indigo_specifics>/full_definitions/<manufacturer_id>/<device_filename>
@@ -430,21 +445,33 @@ def process_device(base_dir: Path, script_dir: Path, manufacturer_id: str, devic
         existing_version = 1
         file_exists = output_path.exists()
 
+        # Digest of the resolved configuration (without metadata), kept in a sidecar file so an
+        # unchanged configuration is recognized without loading and comparing the existing file
+        config_hash = config_digest(resolved_config)
+        hash_path = output_path.with_name(output_path.name + '.hash')
+
         # Check if file already exists and compare
         if file_exists:
-            with open(output_path, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
+            unchanged = read_stored_digest(hash_path, output_path) == config_hash
+
+            if not unchanged:
+                existing_data = loads(read_file(output_path))
+
+                # Get existing version number
+                existing_version = existing_data.get('vers', 1)
 
-            # Get existing version number
-            existing_version = existing_data.get('vers', 1)
+                # Temporarily add metadata for comparison
+                temp_resolved = resolved_config.copy()
+                temp_resolved['vers'] = existing_version
+                temp_resolved['last_update'] = existing_data.get('last_update', current_timestamp)
 
-            # Temporarily add metadata for comparison
-            temp_resolved = resolved_config.copy()
-            temp_resolved['vers'] = existing_version
-            temp_resolved['last_update'] = existing_data.get('last_update', current_timestamp)
+                # Use semantic JSON comparison instead of string comparison
+                unchanged = JsonDiffer.json_objects_equal(existing_data, temp_resolved)
+                if unchanged:
+                    # Record the digest so the next run can skip the comparison
+                    hash_path.write_text(config_hash + '\n', encoding='utf-8')
 
-            # Use semantic JSON comparison instead of string comparison
-            if JsonDiffer.json_objects_equal(existing_data, temp_resolved):
+            if unchanged:
                 if silent_mode:
                     print(str(output_path))
                 else:
@@ -481,14 +508,22 @@ def process_device(base_dir: Path, script_dir: Path, manufacturer_id: str, devic
         resolved_config['vers'] = existing_version
         resolved_config['last_update'] = current_timestamp
 
-        # Output the resolved configuration with metadata as formatted JSON
-        json_output = json.dumps(resolved_config, indent=2) + '\n'
+        # Output the resolved configuration with metadata as formatted JSON. This always uses the
+        # stdlib encoder so the committed files are byte-identical whichever backend is installed.
+        json_output = (json.dumps(resolved_config, indent=2) + '\n').encode('utf-8')
 
         # Ensure output directory exists
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(json_output)
+        # Write to a temp file and swap it in so an interrupted write never leaves a partial file
+        tmp_path = output_path.with_suffix('.json.tmp')
+        try:
+            tmp_path.write_bytes(json_output)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        hash_path.write_text(config_hash + '\n', encoding='utf-8')
 
         if silent_mode:
             print(str(output_path))
@@ -504,7 +539,7 @@ def process_device(base_dir: Path, script_dir: Path, manufacturer_id: str, devic
         else:
             print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
-    except (ValueError, KeyError, json.JSONDecodeError) as e:
+    except (ValueError, KeyError, JSONDecodeError) as e:
         if silent_mode:
             print("error")
         else: